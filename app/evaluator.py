@@ -1,12 +1,23 @@
+import functools
 import json
+import operator
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+try:
+	import orjson
+except ImportError:  # optional speedup; the stdlib parser reads rule files the same way
+	orjson = None
 
 from .models import (
+	PLACE_BITS,
 	ChecklistRequest,
 	ChecklistResponse,
 	ChecklistPlan,
+	PlaceType,
 	Recommendation,
+	RecommendationType,
 	TestingAction,
 )
 
@@ -16,27 +27,63 @@ RULES_DIR = REPO_ROOT / "rules"
 
 
 def _load_json(path: Path) -> Dict[str, Any]:
+	if orjson is not None:
+		return orjson.loads(path.read_bytes())
 	with path.open("r", encoding="utf-8") as f:
 		return json.load(f)
 
 
+def _mtime_ns(path: Path) -> Optional[int]:
+	"""Return the file's mtime in ns, or None if it does not exist (one stat for both)."""
+	try:
+		return path.stat().st_mtime_ns
+	except FileNotFoundError:
+		return None
+
+
+@functools.lru_cache(maxsize=64)
+def _load_rules_cached(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+	return _compile_rules(_load_json(Path(path_str)))
+
+
+def _load_rules(path: Path, mtime_ns: Optional[int] = None) -> Dict[str, Any]:
+	"""Parse and compile a rule file, cached per (path, mtime).
+
+	Only _build_state_cache reads these: it merges and freezes them, and requests see
+	the frozen copies. The mutable docs stay cached so reload_rules() doesn't re-parse
+	unchanged files. Returned dicts are shared: do not mutate them.
+	"""
+	if mtime_ns is None:
+		mtime_ns = path.stat().st_mtime_ns
+	return _load_rules_cached(str(path), mtime_ns)
+
+
 def _deep_merge(base: Dict[str, Any], overlay: Dict[str, Any]) -> Dict[str, Any]:
-	"""Recursively merge overlay into base. Lists are concatenated; scalars are overridden."""
-	result: Dict[str, Any] = {**base}
-	for key, overlay_value in overlay.items():
-		if key in result:
-			base_value = result[key]
-			if isinstance(base_value, dict) and isinstance(overlay_value, dict):
-				result[key] = _deep_merge(base_value, overlay_value)
-			elif isinstance(base_value, list) and isinstance(overlay_value, list):
-				result[key] = base_value + overlay_value
+	"""Merge overlay into a copy of base. Lists are concatenated; scalars are overridden.
+
+	Iterative: only dicts present on both sides are copied, and neither argument is mutated.
+	"""
+	result: Dict[str, Any] = dict(base)
+	stack: List[Tuple[Dict[str, Any], Dict[str, Any]]] = [(result, overlay)]
+	while stack:
+		dst, src = stack.pop()
+		for key, overlay_value in src.items():
+			base_value = dst.get(key)
+			# Exact class checks: rule files are plain JSON, and this is cheaper than isinstance
+			if base_value.__class__ is dict and overlay_value.__class__ is dict:
+				merged = dict(base_value)
+				dst[key] = merged
+				stack.append((merged, overlay_value))
+			elif base_value.__class__ is list and overlay_value.__class__ is list:
+				# base_value still belongs to base, so it can't be extended in place;
+				# + is the single allocation needed
+				dst[key] = base_value + overlay_value
 			else:
-				result[key] = overlay_value
-		else:
-			result[key] = overlay_value
+				dst[key] = overlay_value
 	return result
 
 
+@functools.lru_cache(maxsize=128)
 def _normalize_state_parts(state: str) -> (str, Optional[str]):
 	"""Return (country, region) where region may be None. Accepts 'US', 'CA', 'US-CA'."""
 	s = state.strip()
@@ -60,6 +107,7 @@ _STATE_NAME_TO_ABBR = {
 }
 
 
+@functools.lru_cache(maxsize=128)
 def _normalize_state_input(state_code: Optional[str]) -> Optional[str]:
 	if not state_code:
 		return None
@@ -80,44 +128,167 @@ def _jurisdiction_to_path(j: str) -> Path:
 	return RULES_DIR.joinpath(*parts).with_suffix(".json")
 
 
-def load_rules_chain(state_code: Optional[str]) -> Tuple[List[str], Dict[str, Any]]:
-	"""Return jurisdiction chain and merged ruleset (base with overlay)."""
+# Read-only rulesets, built once at import; call reload_rules() after editing files
+# under RULES_DIR. Merged rulesets are keyed by state abbreviation ("US" holds the base
+# rules alone), single rule files by jurisdiction, e.g. "US/CA/common".
+_MERGED_BY_STATE: Dict[str, Mapping[str, Any]] = {}
+_DOC_BY_JURISDICTION: Dict[str, Mapping[str, Any]] = {}
+
+
+def _freeze(value: Any, memo: Dict[int, Any]) -> Any:
+	"""Return value with dicts as MappingProxyType and lists as tuples, recursively.
+
+	memo maps id() of already frozen containers, so objects shared between rulesets
+	(e.g. rule dicts) stay shared once frozen.
+	"""
+	cls = value.__class__
+	if cls is not dict and cls is not list:
+		return value
+	frozen = memo.get(id(value))
+	if frozen is None:
+		if cls is dict:
+			frozen = MappingProxyType({k: _freeze(v, memo) for k, v in value.items()})
+		else:
+			frozen = tuple(_freeze(v, memo) for v in value)
+		memo[id(value)] = frozen
+	return frozen
+
+
+def _build_state_cache() -> None:
+	base_path = _jurisdiction_to_path("US/common")
+	base_mtime = _mtime_ns(base_path)
+	if base_mtime is None:
+		raise FileNotFoundError(f"Base rules not found at {base_path}")
+	base = _load_rules(base_path, base_mtime)
+	docs: Dict[str, Dict[str, Any]] = {"US/common": base}
+	merged_by_state: Dict[str, Dict[str, Any]] = {"US": base}
+	for overlay_path in sorted((RULES_DIR / "US").glob("*/common.json")):
+		overlay = _load_rules(overlay_path)
+		merged = _deep_merge(base, overlay)
+		# The merged list concatenates base and overlay rules; re-sort across both
+		merged["_rules_sorted"] = _sort_rules(merged.get("rules", []) or [])
+		docs[f"US/{overlay_path.parent.name}/common"] = overlay
+		merged_by_state[overlay_path.parent.name] = merged
+	# Freeze only after merging: _deep_merge only descends into plain dicts and lists
+	memo: Dict[int, Any] = {}
+	frozen_docs = {k: _freeze(v, memo) for k, v in docs.items()}
+	frozen_merged = {k: _freeze(v, memo) for k, v in merged_by_state.items()}
+	# Swap in whole dicts so concurrent requests never see a half-built cache. Docs go
+	# first: a chain taken from the new merged rulesets always finds its files.
+	global _MERGED_BY_STATE, _DOC_BY_JURISDICTION
+	_DOC_BY_JURISDICTION = frozen_docs
+	_MERGED_BY_STATE = frozen_merged
+
+
+def reload_rules() -> None:
+	"""Rebuild the merged ruleset cache from the files under RULES_DIR."""
+	_build_state_cache()
+	_evaluate_cached.cache_clear()
+
+
+def load_rules_chain(state_code: Optional[str]) -> Tuple[List[str], Mapping[str, Any]]:
+	"""Return jurisdiction chain and read-only merged ruleset (base with overlay)."""
 	chain: List[str] = ["US/common"]
-	base = _load_json(_jurisdiction_to_path("US/common"))
-	merged = dict(base)
 	state_abbr = _normalize_state_input(state_code)
-	if state_abbr:
-		state_path = RULES_DIR / "US" / state_abbr / "common.json"
-		if state_path.exists():
-			chain.append(f"US/{state_abbr}/common")
-			merged = _deep_merge(merged, _load_json(state_path))
-	return chain, merged
+	if state_abbr and state_abbr != "US" and state_abbr in _MERGED_BY_STATE:
+		chain.append(f"US/{state_abbr}/common")
+		return chain, _MERGED_BY_STATE[state_abbr]
+	return chain, _MERGED_BY_STATE["US"]
 
 
-def load_rules_for_state(state: str) -> Dict[str, Any]:
-	"""Load base US rules and optional state overlay if present."""
+def load_rules_for_state(state: str) -> Mapping[str, Any]:
+	"""Return read-only base US rules merged with the state overlay if present."""
 	country, region = _normalize_state_parts(state)
-	base_path = RULES_DIR / "US" / "common.json"
-	if not base_path.exists():
-		raise FileNotFoundError(f"Base rules not found at {base_path}")
-	merged = _load_json(base_path)
 	if country == "US" and region:
-		overlay_path = RULES_DIR / "US" / region / "common.json"
-		if overlay_path.exists():
-			overlay = _load_json(overlay_path)
-			merged = _deep_merge(merged, overlay)
-	return merged
+		return _MERGED_BY_STATE.get(region, _MERGED_BY_STATE["US"])
+	return _MERGED_BY_STATE["US"]
+
+
+class Inputs:
+	"""Request facts that rule conditions are evaluated against, built once per request.
+
+	Slotted so compiled conditions read fields with attrgetter instead of hashing dict keys.
+	"""
+
+	__slots__ = (
+		"state",
+		"property_type",
+		"bedrooms",
+		"floors",
+		"has_fuel_garage",
+		"has_fuel_appliance",
+		"has_attached_garage",
+		"year_bucket",
+		"interconnect_present",
+		"permit_planned",
+	)
+
+	def __init__(
+		self,
+		state: str,
+		property_type: str,
+		bedrooms: int,
+		floors: int,
+		has_fuel_appliance: bool,
+		has_attached_garage: bool,
+		year_bucket: Optional[str],
+		interconnect_present: str,
+		permit_planned: bool,
+		has_fuel_garage: Optional[bool] = None,
+	) -> None:
+		self.state = state
+		self.property_type = property_type
+		self.bedrooms = bedrooms
+		self.floors = floors
+		self.has_fuel_garage = has_fuel_garage
+		self.has_fuel_appliance = has_fuel_appliance
+		self.has_attached_garage = has_attached_garage
+		self.year_bucket = year_bucket
+		self.interconnect_present = interconnect_present
+		self.permit_planned = permit_planned
+
+	@staticmethod
+	def request_key(req: ChecklistRequest) -> Tuple[Any, ...]:
+		"""Constructor arguments for req; hashable, so usable as a cache key."""
+		return (
+			req.state,
+			req.property_type.value,
+			req.bedrooms,
+			req.floors,
+			req.has_fuel_appliance,
+			req.has_attached_garage,
+			req.year_bucket.value if req.year_bucket is not None else None,
+			req.interconnect_present.value,
+			req.permit_planned,
+		)
+
+	@classmethod
+	def from_request(cls, req: ChecklistRequest) -> "Inputs":
+		"""Inputs for evaluate_checklist, which also gives rules the derived has_fuel_garage."""
+		return cls(*cls.request_key(req), has_fuel_garage=req.has_fuel_appliance or req.has_attached_garage)
+
+
+def _read_none(inputs: Inputs) -> None:
+	return None
 
 
-def _get_input_value(inputs: Dict[str, Any], field: str) -> Any:
-	return inputs.get(field)
+# Only slots are request facts; other attributes of Inputs (e.g. request_key) are not
+_INPUT_GETTERS: Dict[str, Callable[[Inputs], Any]] = {f: operator.attrgetter(f) for f in Inputs.__slots__}
 
 
-def _match_leaf_condition(cond: Dict[str, Any], inputs: Dict[str, Any]) -> bool:
+def _input_getter(field: str) -> Callable[[Inputs], Any]:
+	# Fields that are not request facts read as None, as a missing dict key did
+	return _INPUT_GETTERS.get(field, _read_none)
+
+
+def _match_leaf_condition(cond: Mapping[str, Any], inputs: Inputs) -> bool:
 	field = cond.get("field")
 	if not field:
 		return True
-	value = _get_input_value(inputs, field)
+	return _match_leaf_value(cond, _INPUT_GETTERS.get(field, _read_none)(inputs))
+
+
+def _match_leaf_value(cond: Mapping[str, Any], value: Any) -> bool:
 	if "eq" in cond:
 		return value == cond["eq"]
 	if "ne" in cond:
@@ -145,7 +316,7 @@ def _match_leaf_condition(cond: Dict[str, Any], inputs: Dict[str, Any]) -> bool:
 	return True
 
 
-def _match_condition(condition: Optional[Dict[str, Any]], inputs: Dict[str, Any]) -> bool:
+def _match_condition(condition: Optional[Mapping[str, Any]], inputs: Inputs) -> bool:
 	if not condition:
 		return True
 	if "all" in condition:
@@ -157,48 +328,108 @@ def _match_condition(condition: Optional[Dict[str, Any]], inputs: Dict[str, Any]
 	return _match_leaf_condition(condition, inputs)
 
 
-def _match_when_new_schema(condition: Optional[Dict[str, Any]], inputs: Dict[str, Any]) -> bool:
-	"""Matcher for compact schema 'when'. Supports: always, all, any, not, eq(map)."""
-	if not condition:
-		return True
-	if isinstance(condition, bool):
-		return bool(condition)
+WhenFn = Callable[[Inputs], bool]
+
+_COMPARE_OPS: Tuple[Tuple[str, Callable[[Any, Any], bool]], ...] = (
+	("gte", operator.ge),
+	("gt", operator.gt),
+	("lte", operator.le),
+	("lt", operator.lt),
+)
+
+
+def _always_true(inputs: Inputs) -> bool:
+	return True
+
+
+def _always_false(inputs: Inputs) -> bool:
+	return False
+
+
+def _compile_when(condition: Any, negate: bool = False) -> WhenFn:
+	"""Compile a compact schema 'when' into a predicate over inputs.
+
+	Supports: always, all, any, not, eq(map), and gte/gt/lte/lt(map); anything else is
+	treated as an old-style leaf. A missing/empty condition matches. 'not' is pushed
+	down to the leaves at compile time (De Morgan) rather than wrapping the child.
+	"""
+	if not condition or isinstance(condition, bool):
+		return _always_false if negate else _always_true
 	if "always" in condition:
-		return bool(condition.get("always"))
-	if "all" in condition:
-		return all(_match_when_new_schema(c, inputs) for c in condition["all"])
-	if "any" in condition:
-		return any(_match_when_new_schema(c, inputs) for c in condition["any"])
+		return _always_false if bool(condition.get("always")) == negate else _always_true
+	if "all" in condition or "any" in condition:
+		is_all = "all" in condition
+		subs = tuple(_compile_when(c, negate) for c in condition["all" if is_all else "any"])
+		# not all(...) == any(not ...), and vice versa
+		if is_all != negate:
+			return lambda inputs: all(p(inputs) for p in subs)
+		return lambda inputs: any(p(inputs) for p in subs)
 	if "not" in condition:
-		return not _match_when_new_schema(condition["not"], inputs)
+		return _compile_when(condition["not"], not negate)
 	if "eq" in condition:
-		m = condition["eq"] or {}
-		for k, v in m.items():
-			if inputs.get(k) != v:
-				return False
-		return True
-	# Optional simple operators: {"gte": {"floors": 2}} etc.
-	for op in ("gte", "gt", "lte", "lt"):
+		items = tuple((_input_getter(k), v) for k, v in (condition["eq"] or {}).items())
+		if negate:
+			return lambda inputs: any(get(inputs) != v for get, v in items)
+		return lambda inputs: all(get(inputs) == v for get, v in items)
+	for op, compare in _COMPARE_OPS:
 		if op in condition:
-			m = condition[op] or {}
-			for k, v in m.items():
-				val = inputs.get(k)
-				if val is None:
-					return False
-				if op == "gte" and not (val >= v):
-					return False
-				if op == "gt" and not (val > v):
-					return False
-				if op == "lte" and not (val <= v):
-					return False
-				if op == "lt" and not (val < v):
-					return False
-			return True
-	# Fallback to old leaf style if given
-	return _match_leaf_condition(condition, inputs)
+			bounds = tuple((_input_getter(k), v) for k, v in (condition[op] or {}).items())
+
+			def match_bounds(inputs: Inputs) -> bool:
+				for get, v in bounds:
+					val = get(inputs)
+					if val is None or not compare(val, v):
+						return False
+				return True
+
+			if negate:
+				return lambda inputs: not match_bounds(inputs)
+			return match_bounds
+	# Fallback to old leaf style if given; the field getter is resolved once here
+	field = condition.get("field")
+	if not field:
+		return _always_false if negate else _always_true
+	get = _input_getter(field)
+	if negate:
+		return lambda inputs: not _match_leaf_value(condition, get(inputs))
+	return lambda inputs: _match_leaf_value(condition, get(inputs))
+
+
+# Each recommendation type gets its own run of place bits, so every (type, place)
+# slot is a distinct single-bit int.
+_TYPE_SHIFT: Dict[str, int] = {t.value: i * len(PlaceType) for i, t in enumerate(RecommendationType)}
 
 
-def _evaluate_section(section_rules: List[Dict[str, Any]], inputs: Dict[str, Any]) -> List[str]:
+def _rec_slot(rec_type: str, place: str) -> int:
+	"""Bit for a (type, place) recommendation slot, or 0 if either is unknown."""
+	if rec_type not in _TYPE_SHIFT or place not in PLACE_BITS:
+		return 0
+	return PLACE_BITS[place] << _TYPE_SHIFT[rec_type]
+
+
+def _sort_rules(rules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+	# Priority desc; sorted() is stable, so ties keep file order
+	return sorted(rules, key=operator.itemgetter("priority"), reverse=True)
+
+
+def _compile_rules(doc: Dict[str, Any]) -> Dict[str, Any]:
+	"""Prepare compact schema rules in doc for evaluation.
+
+	Coerces each rule's priority to int, attaches a compiled '_when_fn' predicate,
+	tags each recommendation with its '_slot' bit and stores the priority-sorted rule
+	list under '_rules_sorted'.
+	"""
+	rules = doc.get("rules", []) or []
+	for rule in rules:
+		rule["priority"] = int(rule.get("priority", 0))
+		rule["_when_fn"] = _compile_when(rule.get("when"))
+		for rec in rule.get("recommend", []) or []:
+			rec["_slot"] = _rec_slot(str(rec.get("type")), str(rec.get("place")))
+	doc["_rules_sorted"] = _sort_rules(rules)
+	return doc
+
+
+def _evaluate_section(section_rules: List[Mapping[str, Any]], inputs: Inputs) -> List[str]:
 	results: List[str] = []
 	for rule in section_rules:
 		when = rule.get("when")
@@ -209,44 +440,47 @@ def _evaluate_section(section_rules: List[Dict[str, Any]], inputs: Dict[str, Any
 	return results
 
 
+# Phrase tables for the legacy plain-text checklist
+_PLACE_PHRASE = {
+	"each_bedroom": "inside every bedroom.",
+	"outside_sleeping_areas": "outside each sleeping area.",
+	"each_level_incl_basement": "on every level, including basements.",
+	"near_sleeping_areas": "near sleeping areas.",
+	"common_hallways": "in common hallways.",
+	"other": "as noted.",
+}
+
+_ACTION_PHRASE = {
+	"test": "Test",
+	"clean": "Clean",
+	"replace_battery": "Replace battery",
+	"replace_device": "Replace device",
+}
+
+_FREQ_PHRASE = {
+	"monthly": "monthly",
+	"quarterly": "quarterly",
+	"annual": "annually",
+	"10_years": "every 10 years",
+	"per_manufacturer": "per manufacturer",
+}
+
+
 def evaluate_checklist(req: ChecklistRequest) -> ChecklistResponse:
 	merged_rules = load_rules_for_state(req.state)
-	inputs: Dict[str, Any] = {
-		"state": req.state,
-		"property_type": str(req.property_type),
-		"bedrooms": req.bedrooms,
-		"floors": req.floors,
-		"has_fuel_garage": bool(getattr(req, "has_fuel_appliance", False) or getattr(req, "has_attached_garage", False)),
-		"has_fuel_appliance": getattr(req, "has_fuel_appliance", False),
-		"has_attached_garage": getattr(req, "has_attached_garage", False),
-		"year_bucket": str(req.year_bucket) if getattr(req, "year_bucket", None) is not None else None,
-		"interconnect_present": str(req.interconnect_present) if getattr(req, "interconnect_present", None) is not None else None,
-		"permit_planned": req.permit_planned,
-	}
+	inputs = Inputs.from_request(req)
 
 	# New compact schema path
 	if "rules" in merged_rules:
-		smoke: List[str] = []
-		co: List[str] = []
-		devices: List[str] = []
-		notes: List[str] = []
+		# Insertion-ordered dicts dedupe without scanning the lists
+		smoke: Dict[str, None] = {}
+		co: Dict[str, None] = {}
+		devices: Dict[str, None] = {}
+		notes: Dict[str, None] = {}
 		citations_set = set()
-		# Sort rules by priority desc then stable index
-		rules_list = list(merged_rules.get("rules", []))
-		rules_list.sort(key=lambda r: int(r.get("priority", 0)), reverse=True)
-
-		place_phrase = {
-			"each_bedroom": "inside every bedroom.",
-			"outside_sleeping_areas": "outside each sleeping area.",
-			"each_level_incl_basement": "on every level, including basements.",
-			"near_sleeping_areas": "near sleeping areas.",
-			"common_hallways": "in common hallways.",
-			"other": "as noted.",
-		}
 
-		for rule in rules_list:
-			when = rule.get("when")
-			if not _match_when_new_schema(when, inputs):
+		for rule in merged_rules["_rules_sorted"]:
+			if not rule["_when_fn"](inputs):
 				continue
 			for rec in rule.get("recommend", []) or []:
 				rec_type = rec.get("type")
@@ -255,7 +489,7 @@ def evaluate_checklist(req: ChecklistRequest) -> ChecklistResponse:
 				citation = rec.get("citation")
 				if citation:
 					citations_set.add(str(citation))
-				phrase = place_phrase.get(str(place), "as noted.")
+				phrase = _PLACE_PHRASE.get(str(place), "as noted.")
 				if rec_type == "co":
 					text = f"Install CO alarm {phrase}"
 				elif rec_type == "smoke":
@@ -265,56 +499,40 @@ def evaluate_checklist(req: ChecklistRequest) -> ChecklistResponse:
 				if note:
 					text = f"{text} {note}".strip()
 				if rec_type == "smoke":
-					if text not in smoke:
-						smoke.append(text)
+					smoke[text] = None
 				elif rec_type == "co":
-					if text not in co:
-						co.append(text)
+					co[text] = None
 				else:
-					if text not in devices:
-						devices.append(text)
+					devices[text] = None
 			for n in rule.get("notes", []) or []:
-				if n not in notes:
-					notes.append(n)
+				notes[n] = None
 
 		# testing block
-		testing_entries: List[str] = []
+		testing_entries: Dict[str, None] = {}
 		for t in merged_rules.get("testing", []) or []:
 			action = str(t.get("action", "")).strip()
 			freq = str(t.get("frequency", "")).strip()
 			note = t.get("note")
 			if not action or not freq:
 				continue
-			phrase = {
-				"test": "Test",
-				"clean": "Clean",
-				"replace_battery": "Replace battery",
-				"replace_device": "Replace device",
-			}.get(action, action.capitalize())
-			when_text = {
-				"monthly": "monthly",
-				"quarterly": "quarterly",
-				"annual": "annually",
-				"10_years": "every 10 years",
-				"per_manufacturer": "per manufacturer",
-			}.get(freq, freq)
+			phrase = _ACTION_PHRASE.get(action, action.capitalize())
+			when_text = _FREQ_PHRASE.get(freq, freq)
 			line = f"{phrase} {when_text}."
 			if note:
 				line = f"{line} {note}".strip()
-			if line not in testing_entries:
-				testing_entries.append(line)
+			testing_entries[line] = None
 
 		return ChecklistResponse(
-			smoke=smoke,
-			co=co,
-			devices=devices,
-			testing=testing_entries,
-			notes=notes,
+			smoke=list(smoke),
+			co=list(co),
+			devices=list(devices),
+			testing=list(testing_entries),
+			notes=list(notes),
 			citations=sorted(citations_set),
 		)
 
 	# Legacy schema path
-	def section(name: str) -> List[Dict[str, Any]]:
+	def section(name: str) -> List[Mapping[str, Any]]:
 		return list(merged_rules.get(name, []))
 
 	return ChecklistResponse(
@@ -329,45 +547,57 @@ def evaluate_checklist(req: ChecklistRequest) -> ChecklistResponse:
 
 def evaluate(plan_request: ChecklistRequest) -> ChecklistPlan:
 	"""Evaluate compact schema into a structured ChecklistPlan."""
-	chain, _ = load_rules_chain(plan_request.state)
-	inputs: Dict[str, Any] = {
-		"state": plan_request.state,
-		"property_type": str(plan_request.property_type),
-		"bedrooms": plan_request.bedrooms,
-		"floors": plan_request.floors,
-		"has_fuel_appliance": getattr(plan_request, "has_fuel_appliance", False),
-		"has_attached_garage": getattr(plan_request, "has_attached_garage", False),
-		"year_bucket": str(plan_request.year_bucket) if getattr(plan_request, "year_bucket", None) is not None else None,
-		"interconnect_present": str(plan_request.interconnect_present) if getattr(plan_request, "interconnect_present", None) is not None else None,
-		"permit_planned": plan_request.permit_planned,
-	}
-
-	# Helper to know specificity: later in chain is more specific
-	def specificity_index(j: str) -> int:
-		return chain.index(j)
+	# Plans are cached per request facts; return a copy so callers can't alter the cached one
+	return _copy_plan(_evaluate_cached(Inputs.request_key(plan_request)))
+
+
+def _copy_plan(plan: ChecklistPlan) -> ChecklistPlan:
+	# Nested models only hold scalars, so copying one level down isolates the copy.
+	# Several times cheaper than model_copy(deep=True).
+	return plan.model_copy(
+		update={
+			"recommendations": [r.model_copy() for r in plan.recommendations],
+			"testing": [t.model_copy() for t in plan.testing],
+			"notes": list(plan.notes),
+			"jurisdiction_chain": list(plan.jurisdiction_chain),
+			"resources": [dict(res) for res in plan.resources] if plan.resources is not None else None,
+		}
+	)
+
+
+@functools.lru_cache(maxsize=1024)
+def _evaluate_cached(key: Tuple[Any, ...]) -> ChecklistPlan:
+	inputs = Inputs(*key)
+	chain, _ = load_rules_chain(inputs.state)
 
 	# Aggregate recommendations and notes
-	rec_by_key: Dict[Tuple[str, str], Dict[str, Any]] = {}
-	plan_notes: List[str] = []
-
-	# Process jurisdiction in order
-	for j in chain:
-		doc = _load_json(_jurisdiction_to_path(j))
-		priority_sorted = sorted(doc.get("rules", []), key=lambda r: int(r.get("priority", 0)), reverse=True)
-		for rule in priority_sorted:
-			if not _match_when_new_schema(rule.get("when"), inputs):
+	rec_by_key: Dict[int, Dict[str, Any]] = {}
+	plan_notes: Dict[str, None] = {}
+
+	# Load each jurisdiction's rules once; every pass below shares them
+	docs = [(j, _DOC_BY_JURISDICTION[j]) for j in chain]
+
+	# Process jurisdiction in order; later in chain is more specific
+	for specificity, (j, doc) in enumerate(docs):
+		for rule in doc["_rules_sorted"]:
+			if not rule["_when_fn"](inputs):
 				continue
 			for rec in rule.get("recommend", []) or []:
-				key = (str(rec.get("type")), str(rec.get("place")))
+				rec_type = str(rec.get("type"))
+				place = str(rec.get("place"))
+				key = rec["_slot"]
+				if not key:
+					raise ValueError(f"Unknown recommendation type/place: {rec_type}/{place}")
 				new_item = {
-					"type": key[0],
-					"place": key[1],
+					"type": rec_type,
+					"place": place,
 					"notes": [rec.get("note")] if rec.get("note") else [],
 					"citations": set([str(rec.get("citation"))]) if rec.get("citation") else set(),
 					"source": rec.get("source") or j,
 					"confidence": rec.get("confidence"),
-					"priority": int(rule.get("priority", 0)),
+					"priority": rule["priority"],
 					"jurisdiction": j,
+					"specificity": specificity,
 				}
 				existing = rec_by_key.get(key)
 				if not existing:
@@ -377,7 +607,7 @@ def evaluate(plan_request: ChecklistRequest) -> ChecklistPlan:
 				better = False
 				if new_item["priority"] > existing["priority"]:
 					better = True
-				elif new_item["priority"] == existing["priority"] and specificity_index(j) > specificity_index(existing["jurisdiction"]):
+				elif new_item["priority"] == existing["priority"] and specificity > existing["specificity"]:
 					better = True
 				if better:
 					# Keep union of notes/citations
@@ -389,8 +619,7 @@ def evaluate(plan_request: ChecklistRequest) -> ChecklistPlan:
 					existing["notes"] = list({*existing["notes"], *new_item["notes"]})
 					existing["citations"] |= set(new_item["citations"])  # type: ignore
 			for n in rule.get("notes", []) or []:
-				if n not in plan_notes:
-					plan_notes.append(n)
+				plan_notes[n] = None
 
 	# Build recommendations list
 	recommendations: List[Recommendation] = []
@@ -406,11 +635,12 @@ def evaluate(plan_request: ChecklistRequest) -> ChecklistPlan:
 			)
 		)
 
-	# Testing: start with most specific, then append unique from less specific
+	# Testing and resources: start with most specific, then append unique from less specific
 	testing_seen: set[Tuple[str, str]] = set()
 	testing_actions: List[TestingAction] = []
-	for j in reversed(chain):  # most specific first
-		doc = _load_json(_jurisdiction_to_path(j))
+	resources: List[Dict[str, str]] = []
+	seen_urls: set[str] = set()
+	for _, doc in reversed(docs):
 		for t in doc.get("testing", []) or []:
 			key = (str(t.get("action")), str(t.get("frequency")))
 			if key in testing_seen:
@@ -424,15 +654,7 @@ def evaluate(plan_request: ChecklistRequest) -> ChecklistPlan:
 					citation=t.get("citation"),
 				)
 			)
-
-	# Reverse to keep most specific first as appended; optional
-	testing_actions = list(testing_actions)
-
-	# Collect resources from the chain (most specific first), de-duped by URL
-	resources: List[Dict[str, str]] = []
-	seen_urls: set[str] = set()
-	for j in reversed(chain):
-		doc = _load_json(_jurisdiction_to_path(j))
+		# Resources are de-duped by URL
 		for res in (doc.get("meta", {}).get("resources", []) or []):
 			url = str(res.get("url", "")).strip()
 			label = str(res.get("label", "")).strip() or url
@@ -444,9 +666,10 @@ def evaluate(plan_request: ChecklistRequest) -> ChecklistPlan:
 	return ChecklistPlan(
 		recommendations=recommendations,
 		testing=testing_actions,
-		notes=plan_notes,
+		notes=list(plan_notes),
 		jurisdiction_chain=chain,
-		resources=resources,
+		resources=resources or None,
 	)
 
 
+_build_state_cache()
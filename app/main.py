@@ -8,8 +8,14 @@ from starlette.staticfiles import StaticFiles
 from .evaluator import evaluate_checklist, evaluate
 from .models import ChecklistRequest, ChecklistResponse, ChecklistPlan
 
+try:
+	import orjson  # noqa: F401
+	from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:  # optional speedup; fall back to stdlib JSON encoding
+	DefaultResponse = JSONResponse
 
-app = FastAPI(title="Fire Alarm Compliance")
+
+app = FastAPI(title="Fire Alarm Compliance", default_response_class=DefaultResponse)
 
 # CORS - open for MVP
 app.add_middleware(
@@ -1,6 +1,6 @@
 from datetime import date
 from enum import Enum
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -38,6 +38,11 @@ class PlaceType(str, Enum):
 	other = "other"
 
 
+# One bit per placement so sets of places can be combined with | and &.
+# Keyed by value; PlaceType members hash and compare equal to their values.
+PLACE_BITS: Dict[str, int] = {p.value: 1 << i for i, p in enumerate(PlaceType)}
+
+
 class TestingActionType(str, Enum):
 	test = "test"
 	clean = "clean"
@@ -77,7 +82,7 @@ class ChecklistRequest(BaseModel):
 	@model_validator(mode="after")
 	def _compute_compat_fields(self) -> "ChecklistRequest":
 		if self.has_fuel_garage is None:
-			self.has_fuel_garage = bool(self.has_fuel_appliance or self.has_attached_garage)
+			self.has_fuel_garage = self.has_fuel_appliance or self.has_attached_garage
 		return self
 
 
@@ -102,8 +107,8 @@ class ChecklistPlan(BaseModel):
 	testing: List[TestingAction] = []
 	notes: List[str] = []
 	jurisdiction_chain: List[str] = []
-	# Optional: authoritative links per jurisdiction
-	resources: List[dict] = []
+	# Optional: authoritative links per jurisdiction; None when the chain has none
+	resources: Optional[List[dict]] = None
 
 
 # Removed ICSRequest after calendar functionality was dropped
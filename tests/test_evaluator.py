@@ -1,9 +1,28 @@
+import shutil
+
 import pytest
 
+from app import evaluator
 from app.evaluator import evaluate
 from app.models import ChecklistRequest
 
 
+@pytest.fixture
+def rules_overlay(tmp_path, monkeypatch):
+	"""Return a function that adds a state overlay to a copy of the rules tree and reloads."""
+	shutil.copytree(evaluator.RULES_DIR, tmp_path / "rules")
+	monkeypatch.setattr(evaluator, "RULES_DIR", tmp_path / "rules")
+
+	def add(state: str, overlay_json: str) -> None:
+		(tmp_path / "rules" / "US" / state).mkdir()
+		(tmp_path / "rules" / "US" / state / "common.json").write_text(overlay_json, encoding="utf-8")
+		evaluator.reload_rules()
+
+	yield add
+	monkeypatch.undo()
+	evaluator.reload_rules()
+
+
 def test_generic_baseline():
 	req = ChecklistRequest(
 		state="US",
@@ -64,3 +83,125 @@ def test_permit_note():
 	assert any("hardwired" in n.lower() or "interconnect" in n.lower() for n in plan.notes)
 
 
+def test_reload_rules_picks_up_new_overlay(rules_overlay):
+	req = ChecklistRequest(
+		state="NY",
+		property_type="single_family",
+		bedrooms=2,
+		floors=1,
+		has_fuel_appliance=False,
+		has_attached_garage=False,
+	)
+	assert "US/NY/common" not in evaluate(req).jurisdiction_chain
+	rules_overlay("NY", '{"meta": {"jurisdiction": "US/NY/common"}, "rules": [], "testing": []}')
+	assert "US/NY/common" in evaluate(req).jurisdiction_chain
+
+
+def test_enum_fields_match_plain_values(rules_overlay):
+	rules_overlay(
+		"NY",
+		'{"rules": [{"when": {"eq": {"property_type": "apartment", "interconnect_present": "no"}},'
+		' "notes": ["NY: apartment note"]}], "testing": []}',
+	)
+	req = ChecklistRequest(
+		state="NY",
+		property_type="apartment",
+		bedrooms=2,
+		floors=1,
+		has_fuel_appliance=False,
+		has_attached_garage=False,
+		interconnect_present="no",
+	)
+	assert "NY: apartment note" in evaluate(req).notes
+
+
+def _inputs(**overrides):
+	facts = dict(
+		state="US",
+		property_type="single_family",
+		bedrooms=2,
+		floors=1,
+		has_fuel_appliance=False,
+		has_attached_garage=False,
+		year_bucket=None,
+		interconnect_present="unknown",
+		permit_planned=False,
+	)
+	facts.update(overrides)
+	return evaluator.Inputs(**facts)
+
+
+@pytest.mark.parametrize(
+	"cond, expected",
+	[
+		({"not": {"all": [{"eq": {"permit_planned": True}}, {"gte": {"floors": 1}}]}}, True),
+		({"not": {"all": [{"eq": {"permit_planned": False}}, {"gte": {"floors": 1}}]}}, False),
+		({"not": {"any": [{"eq": {"has_fuel_appliance": True}}, {"eq": {"has_attached_garage": True}}]}}, True),
+		({"not": {"any": [{"eq": {"has_fuel_appliance": False}}, {"eq": {"has_attached_garage": True}}]}}, False),
+		({"not": {"eq": {"floors": 1, "bedrooms": 2}}}, False),
+		({"not": {"eq": {"floors": 1, "bedrooms": 3}}}, True),
+		({"not": {"gte": {"floors": 2}}}, True),
+		({"not": {"gte": {"floors": 1}}}, False),
+		({"not": {"not": {"eq": {"floors": 1}}}}, True),
+		({"not": {"not": {"eq": {"floors": 2}}}}, False),
+		({"not": {"all": []}}, False),
+		({"not": {"any": []}}, True),
+		({"not": {"always": False}}, True),
+		({"not": {"always": True}}, False),
+		({"not": {"gte": {"year_bucket": "lt_1999"}}}, True),
+		({"not": {"lt": {"year_bucket": "lt_1999"}}}, True),
+	],
+)
+def test_compile_when_negation(cond, expected):
+	assert evaluator._compile_when(cond)(_inputs()) is expected
+
+
+@pytest.mark.parametrize(
+	"cond, expected",
+	[
+		({"field": "request_key", "ne": None}, False),
+		({"field": "floors", "eq": 1}, True),
+		({"field": "bedrooms", "gte": 3}, False),
+	],
+)
+def test_leaf_condition_reads_only_request_facts(cond, expected):
+	assert evaluator._match_condition(cond, _inputs()) is expected
+
+
+def test_compiled_leaf_fallback_reads_only_request_facts():
+	assert evaluator._compile_when({"field": "request_key", "ne": None})(_inputs()) is False
+
+
+def test_has_fuel_garage_only_given_to_checklist():
+	req = ChecklistRequest(
+		state="US",
+		property_type="single_family",
+		bedrooms=2,
+		floors=1,
+		has_fuel_appliance=True,
+		has_attached_garage=False,
+	)
+	assert evaluator.Inputs.from_request(req).has_fuel_garage is True
+	assert evaluator.Inputs(*evaluator.Inputs.request_key(req)).has_fuel_garage is None
+
+
+def test_cached_plan_is_isolated_from_callers():
+	req = ChecklistRequest(
+		state="CA",
+		property_type="single_family",
+		bedrooms=2,
+		floors=1,
+		has_fuel_appliance=True,
+		has_attached_garage=False,
+	)
+	expected = evaluate(req).model_dump()
+	plan = evaluate(req)
+	plan.recommendations[0].note = "changed"
+	plan.notes.append("extra note")
+	plan.resources[0]["url"] = "https://example.invalid/"
+	assert evaluate(req).model_dump() == expected
+
+
+def test_cached_rules_are_read_only():
+	with pytest.raises(TypeError):
+		evaluator.load_rules_for_state("CA")["rules"][0]["priority"] = 1